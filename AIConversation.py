@@ -5,7 +5,10 @@
 # MIT License (read full license terms at the end of this file or in LICENSE.TXT file)
 
 import base64
-import json
+import functools
+import os
+import sys
+import orjson
 import tiktoken
 from rom_print import COLOR_YELLOW, COLOR_CYAN, COLOR_LIGHT_GREEN, COLOR_GRAY, COLOR_WHITE, printColor, printTwoColors
 
@@ -28,25 +31,84 @@ AIC_MODEL_NAME_FOR_TOKEN_COUNT  = "gpt-4o"
 
 AIC_COMMAND_NEWTOPIC = "newtopic"
 
+#role sets resolved once at import time: membership is one hash lookup instead of
+#building a fresh list literal and comparing element by element on every call
+_ALLOWED_ROLES = frozenset({AIC_ROLE_USER, AIC_ROLE_ASSISTANT, AIC_ROLE_SYSTEM, AIC_ROLE_DEVELOPER, AIC_ROLE_INTERNAL})
+_SYSTEM_ROLES  = frozenset({AIC_ROLE_SYSTEM, AIC_ROLE_DEVELOPER})
+_APPEND_ROLES  = frozenset({AIC_ROLE_USER, AIC_ROLE_ASSISTANT, AIC_ROLE_INTERNAL})
+
+@functools.lru_cache(maxsize=8)
+def _get_encoding(model_name: str) -> "tiktoken.Encoding":
+    """ Resolve (once per model) the tiktoken Encoding object.
+        encoding_for_model() does a registry lookup and may rebuild the BPE encoder,
+        so caching it keeps token counting out of that cost on every message.
+    """
+    return tiktoken.encoding_for_model(model_name)
+
+@functools.lru_cache(maxsize=256)
+def _count_tokens(the_string: str, model_name: str) -> int:
+    """ Token count for a string, memoized on the exact (string, model) pair.
+        Repeated inputs (the system prompt, templated user messages) become a dict hit
+        instead of a fresh BPE encode.
+    """
+    return len(_get_encoding(model_name).encode(the_string))
+
+_B64_CHUNK_SIZE: int = 3 * 65536   #must be a multiple of 3 so no padding appears mid-stream
+
+@functools.lru_cache(maxsize=64)
+def _encode_image_file(image_path: str, mtime_ns: int, size: int) -> str:
+    """ Read a local image file and return it as a base64 data URL.
+        Cached on (path, mtime, size) so the same image referenced multiple times
+        in a conversation is read and base64-encoded only once.
+        The file is encoded in chunks into a preallocated buffer instead of holding
+        the raw bytes, the base64 bytes and the decoded string in RAM all at once.
+    """
+    encoded: bytearray = bytearray(((size + 2) // 3) * 4)
+    pos: int = 0
+    with open(image_path, "rb") as image_file:
+        while chunk := image_file.read(_B64_CHUNK_SIZE):
+            chunk_b64 = base64.b64encode(chunk)
+            encoded[pos:pos + len(chunk_b64)] = chunk_b64
+            pos += len(chunk_b64)
+    del encoded[pos:]   #in case the file shrank between stat() and read()
+    #base64 output is pure ASCII: the ascii codec decodes it without UTF-8 validation
+    return "data:image/jpeg;base64," + encoded.decode("ascii")
+
+def _make_image_payload(url: str, text: str) -> list[dict]:
+    """ Build the two-part image+text content payload used for IMAGE_URL messages."""
+    return [
+        {
+            "type": AIC_TYPE_IMAGE_URL,
+            "image_url": {
+                "url": url
+            }
+        },
+        {
+            "type": AIC_TYPE_TEXT,
+            "text": text
+        }
+    ]
+
 class AIMessageContent:
     """ This class represents the content of a message. It can be a text message or an image message.
     """
+    #one instance per message: __slots__ keeps them small and makes attribute access faster
+    __slots__ = ('__content', '__type', '__image_url', '__text', '__str_cache', '__immutable_dict')
+
     def __init__(self, msg_type: str, msg_image_url: str = "", msg_text: str = "") -> None:
         self.__content:  list[dict[str, str]] = []
         self.__type: str = msg_type
         self.__image_url: str = msg_image_url
         self.__text: str = msg_text
+        self.__str_cache: str = None   #built lazily by to_string, dropped on set_content
         self.set_content(msg_type, msg_image_url, msg_text)
 
 
     def to_dict(self)-> dict[str, str]:
-        my_dict_version: dict[str, str] = {
-            'type': self.__type,
-            'image_url': self.__image_url,
-            'text': self.__text
-        }
-        return my_dict_version
-    
+        #content is immutable between set_content calls, so the canonical dict is
+        #built there once; hand out a copy so callers cannot corrupt it
+        return self.__immutable_dict.copy()
+
     @classmethod
     def from_dict(cls, d):
         return cls(d['type'], d['image_url'], d['text'])
@@ -64,117 +126,104 @@ class AIMessageContent:
         return self.__content
     
     def set_content(self, msg_type: str, msg_image_url: str = "", msg_text: str = "") -> None:
+        handler = _CONTENT_DISPATCH.get(msg_type)
+        if handler is None:
+            raise ValueError("Invalid message type: " + msg_type)
+
         self.__type: str = msg_type
         self.__image_url: str = msg_image_url
         self.__text: str = msg_text
+        self.__str_cache = None
 
-        if msg_type == AIC_TYPE_IMAGE_URL:
-            if msg_image_url.startswith("http"):
-                self.__content = [
-                    {
-                        "type": AIC_TYPE_IMAGE_URL,
-                        "image_url": {
-                            "url": msg_image_url
-                        }
-                    },
-                    {
-                        "type": AIC_TYPE_TEXT,
-                        "text": msg_text
-                    }
-                ]
-            elif msg_image_url.startswith("data:image"):
-                self.__content = [
-                    {
-                        "type": AIC_TYPE_IMAGE_URL,
-                        "image_url": {
-                            "url": msg_image_url
-                        }
-                    },
-                    {
-                        "type": AIC_TYPE_TEXT,
-                        "text": msg_text
-                    }
-                ]
-            else:
-                try:
-                    with open(msg_image_url, "rb") as image_file:
-                        encoded_image: str = base64.b64encode(image_file.read()).decode("utf-8")
-                    self.__image_url = f"data:image/jpeg;base64,{encoded_image}"
-                    self.__content = [
-                        {
-                            "type": AIC_TYPE_IMAGE_URL,
-                            "image_url": {
-                                "url": f"data:image/jpeg;base64,{encoded_image}"
-                            }
-                        },
-                        {
-                            "type": AIC_TYPE_TEXT,
-                            "text": msg_text
-                        }
-                    ]
-                except OSError as e:
-                    print("Error opening image file:", e)
-                    self.__content = [
-                        {
-                            "type": AIC_TYPE_IMAGE_URL,
-                            "image_url": {
-                                "url": f"Error opening image file: {msg_image_url}"
-                            }
-                        },
-                        {
-                            "type": AIC_TYPE_TEXT,
-                            "text": msg_text
-                        }
-                    ]
-
-                
-        elif msg_type == AIC_TYPE_TEXT:
-            self.__content = [
-                {
-                    "type": AIC_TYPE_TEXT,
-                    "text": msg_text
-                }
-            ]
-        elif msg_type == AIC_TYPE_FILE: #for future usages
-            self.__content = [
-                {
-                    "type": AIC_TYPE_FILE,
-                    "text": "This format is not supported yet"
-                }
-            ]
-        elif msg_type == AIC_TYPE_INTERNAL: #store a command, internal message... will be not sent to AI
-            self.__content = [
-                {
-                    "type": AIC_TYPE_INTERNAL,
-                    "text": msg_text
-                }
-            ]            
+        handler(self, msg_image_url, msg_text)
+
+        #the handler may rewrite __image_url (local file -> data URL), so build after it
+        self.__immutable_dict = {
+            'type': self.__type,
+            'image_url': self.__image_url,
+            'text': self.__text
+        }
+
+    def _set_image_url_content(self, msg_image_url: str, msg_text: str) -> None:
+        #remote URLs and ready-made data URLs share the same payload shape; only
+        #local files need the read+encode step
+        if msg_image_url.startswith(("http", "data:image")):
+            self.__content = _make_image_payload(msg_image_url, msg_text)
         else:
-            raise ValueError("Invalid message type: " + msg_type)
-        
+            try:
+                file_stat = os.stat(msg_image_url)
+                data_url: str = _encode_image_file(msg_image_url, file_stat.st_mtime_ns, file_stat.st_size)
+                self.__image_url = data_url
+                self.__content = _make_image_payload(data_url, msg_text)
+            except OSError as e:
+                print("Error opening image file:", e)
+                self.__content = _make_image_payload(f"Error opening image file: {msg_image_url}", msg_text)
+
+    def _set_text_content(self, msg_image_url: str, msg_text: str) -> None:
+        self.__content = [
+            {
+                "type": AIC_TYPE_TEXT,
+                "text": msg_text
+            }
+        ]
+
+    def _set_file_content(self, msg_image_url: str, msg_text: str) -> None: #for future usages
+        self.__content = [
+            {
+                "type": AIC_TYPE_FILE,
+                "text": "This format is not supported yet"
+            }
+        ]
+
+    def _set_internal_content(self, msg_image_url: str, msg_text: str) -> None: #store a command, internal message... will be not sent to AI
+        self.__content = [
+            {
+                "type": AIC_TYPE_INTERNAL,
+                "text": msg_text
+            }
+        ]
+
         
     def to_string(self) -> str:
+        if self.__str_cache is not None:
+            return self.__str_cache
+
         result:str= ""
         if self.__type == AIC_TYPE_IMAGE_URL:
             result = f"Image URL: {self.__image_url}\nText: {self.__text}"
-            self.__content[0]["image_url"]["url"] = self.__image_url
         elif self.__type == AIC_TYPE_FILE:
             result = f"File  URL: {self.__image_url}\nText: {self.__text}"
         elif self.__type == AIC_TYPE_TEXT:
             result = f"Text: {self.__text}"
         elif self.__type == AIC_TYPE_INTERNAL:
             result = f"Text: {self.__text}"
+
+        self.__str_cache = result
         return result
 
 
+#O(1) dispatch for AIMessageContent.set_content, built once at import time
+#instead of an if/elif chain re-evaluated per call
+_CONTENT_DISPATCH = {
+    AIC_TYPE_IMAGE_URL: AIMessageContent._set_image_url_content,
+    AIC_TYPE_TEXT:      AIMessageContent._set_text_content,
+    AIC_TYPE_FILE:      AIMessageContent._set_file_content,
+    AIC_TYPE_INTERNAL:  AIMessageContent._set_internal_content,
+}
+
+
 class AIMessage:
-    def __init__(self, role: str, content_text:str, msg_type:str, content_image_url:str = None, sticky:bool = False) -> None: 
+    __slots__ = ('__role', '__content', '__sticky', '__estimated_tokens', '__is_internal', '__payload_cache')
+
+    def __init__(self, role: str, content_text:str, msg_type:str, content_image_url:str = None, sticky:bool = False, precomputed_tokens:int = None) -> None:
         """ This a message to or from AI assistant. It can be a text message or an image message.
         Args:   role: str - the role of the message. It can be "User" or "System" or "Assistant" - MUST NOT be None
                 msg_type - the type of the message. It can be "text" or "image_url" - MUST NOT be None
                 content_text: str - the text of the message - MUST NOT be None
                 content_image_url: str - the url of the image to be sent. if not None the message contains a link to an image
                 sticky: bool - if the message is sticky or not
+                precomputed_tokens: int - if not None, use this as the token count instead of re-tokenizing the text
+                (used by bulk loaders that already batch-encoded the whole file)
                 NOTE: once built you can change the content_text, content_image_url and sticky flag using the appropriate methods below
                 but it requires you to pass an AIMessageContent object to the set_content method.
                 the get_message_payload() method can be used to build a conversation string to be passed to (Azure) OpenAI
@@ -184,8 +233,9 @@ class AIMessage:
         self.__sticky: bool = sticky
         self.__estimated_tokens: int = 0
         self.__is_internal: bool = False
+        self.__payload_cache: dict = None   #built lazily by get_message_payload, dropped on role/content change
 
-        if (role not in [AIC_ROLE_USER, AIC_ROLE_ASSISTANT, AIC_ROLE_SYSTEM, AIC_ROLE_DEVELOPER, AIC_ROLE_INTERNAL]):
+        if (role not in _ALLOWED_ROLES):
             raise ValueError("Invalid message role: " + role)
 
         if (msg_type == AIC_TYPE_IMAGE_URL):
@@ -204,7 +254,7 @@ class AIMessage:
             if content_text is None or content_text == "":
                 raise ValueError("Missing TEXT for " + msg_type + " message")
             self.__content = AIMessageContent(AIC_TYPE_TEXT, None, content_text)
-            self.__estimated_tokens = self.num_tokens_from_string(content_text)
+            self.__estimated_tokens = precomputed_tokens if precomputed_tokens is not None else self.num_tokens_from_string(content_text)
         elif (msg_type == AIC_TYPE_FILE):
             raise ValueError("Unsupported (yet) message type: " + msg_type)
         else:
@@ -220,11 +270,18 @@ class AIMessage:
 
     def num_tokens_from_string(self, the_string: str, model_name: str = AIC_MODEL_NAME_FOR_TOKEN_COUNT) -> int:
         """return num of tokens from a string... model name sample: gpt-4 """
-        encoding = tiktoken.encoding_for_model(model_name)
-        num_tokens: int = len(encoding.encode(the_string))
-        return num_tokens
+        return _count_tokens(the_string, model_name)
 
     def get_estimated_tokens(self) -> int:
+        #None means "stale" (set_content replaced the text): recompute once and keep the int
+        if self.__estimated_tokens is None:
+            msg_type: str = self.__content.get_type()
+            if msg_type == AIC_TYPE_IMAGE_URL:
+                self.__estimated_tokens = self.num_tokens_from_picture(self.__content.get_image_url()) + self.num_tokens_from_string(self.__content.get_text())
+            elif msg_type == AIC_TYPE_INTERNAL:
+                self.__estimated_tokens = 0
+            else:
+                self.__estimated_tokens = self.num_tokens_from_string(self.__content.get_text())
         return self.__estimated_tokens
     
     def to_dict(self) -> dict[str, str]:
@@ -260,6 +317,7 @@ class AIMessage:
 
     def set_role(self, role: str) -> None:
         self.__role = role
+        self.__payload_cache = None
 
     def set_sticky(self, sticky: bool) -> None:
         """ Sticky messages are not removed from the conversation memory when a new message is added. 
@@ -276,17 +334,54 @@ class AIMessage:
 
     def set_content(self, content: AIMessageContent) -> None:
         self.__content: AIMessageContent = content
+        self.__payload_cache = None
+        self.__estimated_tokens = None  #recomputed lazily on the next get_estimated_tokens
 
     def get_content(self) -> AIMessageContent:
         return self.__content
 
     def get_message_payload(self) -> dict:
-        payload = {
-            "role": self.get_role(),
-            #"sticky": self.is_sticky(),
-            "content": self.get_content().get_content()
-        }
-        return payload
+        if self.__payload_cache is None:
+            self.__payload_cache = {
+                "role": self.get_role(),
+                #"sticky": self.is_sticky(),
+                "content": self.get_content().get_content()
+            }
+        return self.__payload_cache
+
+
+#role -> content color template for the print methods (unknown roles fall back to white)
+_ROLE_COLOR = {
+    AIC_ROLE_USER:      COLOR_WHITE,
+    AIC_ROLE_ASSISTANT: COLOR_LIGHT_GREEN,
+    AIC_ROLE_SYSTEM:    COLOR_YELLOW,
+    AIC_ROLE_DEVELOPER: COLOR_YELLOW,
+    AIC_ROLE_INTERNAL:  COLOR_GRAY,
+}
+
+def _render_message(message: AIMessage, label: str, text_only: bool) -> str:
+    """ Render one message (optional header, colored text, optional image URL) as a
+        single string — the one formatting primitive shared by print, print2 and
+        print_specific_message; label is the caller's index prefix for the header.
+    """
+    content_color: str = _ROLE_COLOR.get(message.get_role(), COLOR_WHITE)
+    parts: list[str] = []
+
+    if not text_only:
+        parts.append(COLOR_CYAN.format(f"{label}{message.get_role().upper()} (type={message.get_type()}, sticky={message.is_sticky()}):"))
+        parts.append("\n")
+    parts.append(content_color.format(f"{message.get_text()}\n"))
+    parts.append("\n")
+
+    if message.get_type() == AIC_TYPE_IMAGE_URL:
+        image_url: str = message.get_url()
+        if image_url.startswith("data:image"):
+            parts.append(content_color.format(f"{image_url[:30]}...{image_url[-30:]}"))
+        else:
+            parts.append(content_color.format(image_url))
+        parts.append("\n")
+
+    return "".join(parts)
 
 
 class AIConversation:
@@ -312,6 +407,15 @@ class AIConversation:
         self.__memory_assistant_tokens: int = 0          #the total number of tokens in the conversation. calculated automatically at every insert/remove
         self.__memory_total_tokens: int     = 0          #the total number of tokens in the conversation. calculated automatically at every insert/remove
 
+        self.__user_tokens_sum: int         = 0          #exact whole-history user sum; unlike __user_tokens it never absorbs window evictions (see __update_token_counters)
+        self.__assistant_tokens_sum: int    = 0          #exact whole-history assistant sum, same note as above
+
+        self.__last_newtopic_index: int     = None       #index of the most recent AIC_COMMAND_NEWTOPIC message, kept up to date on insert/remove
+        self.__sticky_count: int            = 0          #number of sticky messages, kept up to date on insert/remove/stickiness change
+        self.__sticky_refs: list[AIMessage] = []         #sticky messages in conversation order, kept up to date on insert/remove/stickiness change
+        self.__internal_count: int          = 0          #number of internal messages, kept up to date on insert/remove
+        self.__sticky_internal_count: int   = 0          #messages that are BOTH sticky and internal (needed by get_messages_count)
+
         the_system_msg:str = ""
 
         #enforce rules for messages in the conversation:
@@ -323,7 +427,9 @@ class AIConversation:
             #create a standard system message
         
         self.__messages = [AIMessage(AIC_ROLE_SYSTEM, the_system_msg, AIC_TYPE_TEXT, None, True)]
-        
+        self.__sticky_count = 1
+        self.__sticky_refs = [self.__messages[0]]
+
         self.__total_tokens = self.__messages[0].get_estimated_tokens()
         self.__system_message_tokens  = self.__total_tokens
         self.__memory_total_tokens    = self.__total_tokens
@@ -372,34 +478,95 @@ class AIConversation:
 
 
     def load_conversation(self, full_path_name:str) -> None:
-        i:int = 0
         self.__restart_internal()
 
-        with open(full_path_name, "r", encoding="utf-8") as file:
-            for line in file:
-                message = json.loads(line.strip())
-                try:
-                    self.add_message(message["role"], message["content_text"], message["msg_type"], message["content_image_url"], message["sticky"])
-                    i+=1
-                except ValueError as e:
-                    print(f"AIConversation.load_conversation() - Error loading message {i}: {e}")
-                    print(f"Wrong Line {i}: {str(message)}")
-                    continue
-                except Exception as e:
-                    raise e
-        return  
+        #orjson parses the raw bytes directly, no per-line str decode needed
+        with open(full_path_name, "rb") as file:
+            raw_messages: list[dict] = [orjson.loads(line) for line in file if line.strip()]
+
+        #batch-encode all the text payloads in a single call: tiktoken runs the BPE work
+        #natively (and across threads), which is much faster than one encode per message.
+        #Lines without a string payload are left out of the batch: the per-message
+        #ValueError path below reports and skips them, same as before
+        text_messages: list[dict] = [m for m in raw_messages
+                                     if m.get("msg_type") == AIC_TYPE_TEXT and isinstance(m.get("content_text"), str)]
+        token_lists = _get_encoding(AIC_MODEL_NAME_FOR_TOKEN_COUNT).encode_ordinary_batch(
+            [m["content_text"] for m in text_messages], num_threads=os.cpu_count())
+        precomputed: dict[int, int] = {id(m): len(tl) for m, tl in zip(text_messages, token_lists)}
+
+        #construct the messages straight into a preallocated list, applying the same
+        #placement and token arithmetic as add_message but without its per-call
+        #validation/bookkeeping overhead; the remaining state is rebuilt once at the end
+        max_memory:int = self.__max_memory_messages
+        messages: list[AIMessage] = [None] * len(raw_messages)
+        count:int = 0
+        for i, message in enumerate(raw_messages):
+            try:
+                new_msg = AIMessage(message["role"], message["content_text"], message["msg_type"], message["content_image_url"], message["sticky"],
+                                    precomputed_tokens=precomputed.get(id(message)))
+            except ValueError as e:
+                print(f"AIConversation.load_conversation() - Error loading message {i}: {e}")
+                print(f"Wrong Line {i}: {str(message)}")
+                continue
+
+            msg_role:str = new_msg.get_role()
+            l_tokenstoremove:int = 0
+            if msg_role in _SYSTEM_ROLES:
+                if count > 0:
+                    l_tokenstoremove = messages[0].get_estimated_tokens()
+                    messages[0] = new_msg   #same rule as add_message: a later system message replaces the first
+                else:
+                    messages[count] = new_msg
+                    count += 1
+            else:
+                if count > max_memory + 2 and msg_role != AIC_ROLE_INTERNAL:
+                    l_tokenstoremove = messages[count - max_memory - 1].get_estimated_tokens()
+                messages[count] = new_msg
+                count += 1
+            self.__update_token_counters(msg_role, new_msg.get_estimated_tokens(), l_tokenstoremove)
+        del messages[count:]
+
+        self.__messages = messages
+        self.__bulk_finalize()
+        return
+
+    def __bulk_finalize(self) -> None:
+        """ Private method: rebuild the structural bookkeeping (sticky count/refs, newtopic
+            index) in one pass after a bulk load instead of message by message.
+        """
+        self.__sticky_count = 0
+        self.__internal_count = 0
+        self.__sticky_internal_count = 0
+        for message in self.__messages:
+            self.__sticky_count += message.is_sticky()
+            self.__internal_count += message.is_internal()
+            self.__sticky_internal_count += message.is_sticky() and message.is_internal()
+        self.__rebuild_sticky_refs()
+        self.__last_newtopic_index = self.__find_last_newtopic()
+        return
 
     def save_conversation(self, full_path_name:str) -> None:
-        with open(full_path_name, "w", encoding="utf-8") as file:
-            for message in self.__messages:            
-                file.write(json.dumps(message.to_dict()) + '\n')
+        #orjson serializes straight to bytes; join everything and write the file in one go
+        #instead of a per-line concat + write
+        with open(full_path_name, "wb") as file:
+            file.write(b'\n'.join(orjson.dumps(message.to_dict()) for message in self.__messages))
+            file.write(b'\n')
         return
 
     def change_system_message(self, new_system_message: str) -> None:
+        new_msg = AIMessage(AIC_ROLE_SYSTEM, new_system_message, AIC_TYPE_TEXT, None, True)
         if len(self.__messages) == 0:
-            self.__messages.append(AIMessage(AIC_ROLE_SYSTEM, new_system_message, AIC_TYPE_TEXT, None, True))
+            old_tokens: int = 0
+            self.__messages.append(new_msg)
+            self.__sticky_count += 1
         else:
-            self.__messages[0] = AIMessage(AIC_ROLE_SYSTEM, new_system_message, AIC_TYPE_TEXT, None, True)
+            old_tokens = self.__messages[0].get_estimated_tokens()
+            self.__sticky_count += 1 - self.__messages[0].is_sticky()
+            self.__messages[0] = new_msg
+        # keep the incremental counters in sync: swap the old system tokens for the
+        # new ones, otherwise every getter reports the stale prompt size from here on
+        self.__update_token_counters(AIC_ROLE_SYSTEM, new_msg.get_estimated_tokens(), old_tokens)
+        self.__rebuild_sticky_refs()
         return
 
     def __restart_internal(self) -> None:
@@ -412,8 +579,15 @@ class AIConversation:
         self.__memory_user_tokens = 0
         self.__memory_assistant_tokens = 0
         self.__memory_total_tokens = 0
-        self.__biggest_user_msg_tokens = 0          
-        self.__biggest_assistant_msg_tokens = 0          
+        self.__biggest_user_msg_tokens = 0
+        self.__biggest_assistant_msg_tokens = 0
+        self.__last_newtopic_index = None
+        self.__sticky_count = 0
+        self.__sticky_refs = []
+        self.__internal_count = 0
+        self.__sticky_internal_count = 0
+        self.__user_tokens_sum = 0
+        self.__assistant_tokens_sum = 0
 
         return
 
@@ -425,61 +599,74 @@ class AIConversation:
         return
     
 
-    def add_message(self, msg_role:str, msg_text:str, msg_type:str=AIC_TYPE_TEXT, image_url:str = None, is_sticky = False) -> None:
+    def add_message(self, msg_role:str, msg_text:str, msg_type:str=AIC_TYPE_TEXT, image_url:str = None, is_sticky = False, precomputed_tokens:int = None) -> None:
         """ You cannot add a system message after the first message has been added to the conversation.
             You can add as many user and assistant messages as you want.
             A system message will replace the one at the beginning of the conversation.
             Raise an exception for unsupported message types
         """
-        if msg_role not in [AIC_ROLE_USER, AIC_ROLE_ASSISTANT, AIC_ROLE_SYSTEM, AIC_ROLE_INTERNAL, AIC_ROLE_DEVELOPER]:
+        if msg_role not in _ALLOWED_ROLES:
             raise ValueError("Invalid message role: " + msg_role)
 
         l_tokenstoremove:int = 0 
         
         try:
-            new_msg = AIMessage(msg_role, msg_text, msg_type, image_url, is_sticky)
+            new_msg = AIMessage(msg_role, msg_text, msg_type, image_url, is_sticky, precomputed_tokens)
         except Exception as e:
             raise e
         #new_msg = AIMessage(msg_role, msg_text, msg_type, image_url, is_sticky)
 
-        if msg_role in [AIC_ROLE_SYSTEM, AIC_ROLE_DEVELOPER]:
+        if msg_role in _SYSTEM_ROLES:
             if len(self.__messages) >= 1:
                 l_tokenstoremove = self.__messages[0].get_estimated_tokens()
+                self.__sticky_count -= self.__messages[0].is_sticky()
                 self.__messages[0] = new_msg
             else:
                 self.__messages.append(new_msg)
-        elif (len(self.__messages) > self.__max_memory_messages+2) and msg_role not in [AIC_ROLE_INTERNAL]:  #I am addind a non-system_message. I need to remove the oldest one from "memory" calculation
+            self.__sticky_count += new_msg.is_sticky()
+            self.__rebuild_sticky_refs()
+        elif (len(self.__messages) > self.__max_memory_messages+2) and msg_role != AIC_ROLE_INTERNAL:  #I am addind a non-system_message. I need to remove the oldest one from "memory" calculation
             l_tokenstoremove = self.__messages[-self.__max_memory_messages-1].get_estimated_tokens()
         
-        if msg_role in [AIC_ROLE_USER, AIC_ROLE_ASSISTANT, AIC_ROLE_INTERNAL]:
+        if msg_role in _APPEND_ROLES:
             self.__messages.append(new_msg)
+            if new_msg.is_sticky():
+                self.__sticky_count += 1
+                self.__sticky_refs.append(new_msg)
+            if new_msg.is_internal():
+                self.__internal_count += 1
+                self.__sticky_internal_count += new_msg.is_sticky()
+            if msg_role == AIC_ROLE_INTERNAL and msg_text == AIC_COMMAND_NEWTOPIC:
+                self.__last_newtopic_index = len(self.__messages) - 1
+
+        self.__update_token_counters(msg_role, new_msg.get_estimated_tokens(), l_tokenstoremove)
 
-        l_msg_tokens:int     = new_msg.get_estimated_tokens()
-   
+        return
+
+    def __update_token_counters(self, msg_role:str, l_msg_tokens:int, l_tokenstoremove:int) -> None:
+        """ Private method: per-insert token bookkeeping, kept in one place so the
+            counter arithmetic is a single straight-line function per role.
+        """
         if msg_role == AIC_ROLE_USER:
             self.__user_tokens += l_msg_tokens - l_tokenstoremove
+            self.__user_tokens_sum += l_msg_tokens
             self.__total_tokens += l_msg_tokens
-            self.__memory_user_tokens += l_msg_tokens
-            self.__memory_total_tokens += l_msg_tokens
-            self.__memory_user_tokens -= l_tokenstoremove
-            self.__memory_total_tokens -= l_tokenstoremove
+            self.__memory_user_tokens += l_msg_tokens - l_tokenstoremove
+            self.__memory_total_tokens += l_msg_tokens - l_tokenstoremove
             if l_msg_tokens > self.__biggest_user_msg_tokens:
                 self.__biggest_user_msg_tokens = l_msg_tokens
         elif msg_role == AIC_ROLE_ASSISTANT:
             self.__assistant_tokens += l_msg_tokens - l_tokenstoremove
+            self.__assistant_tokens_sum += l_msg_tokens
             self.__total_tokens += l_msg_tokens
-            self.__memory_assistant_tokens += l_msg_tokens
-            self.__memory_total_tokens += l_msg_tokens
-            self.__memory_assistant_tokens -= l_tokenstoremove
-            self.__memory_total_tokens -= l_tokenstoremove
+            self.__memory_assistant_tokens += l_msg_tokens - l_tokenstoremove
+            self.__memory_total_tokens += l_msg_tokens - l_tokenstoremove
             if l_msg_tokens > self.__biggest_assistant_msg_tokens:
                 self.__biggest_assistant_msg_tokens = l_msg_tokens
         elif msg_role == AIC_ROLE_SYSTEM:
             self.__system_message_tokens = l_msg_tokens
-            self.__total_tokens += l_msg_tokens
-            self.__memory_total_tokens += l_msg_tokens
-            self.__total_tokens -= l_tokenstoremove
-            self.__memory_total_tokens -= l_tokenstoremove
+            self.__total_tokens += l_msg_tokens - l_tokenstoremove
+            self.__memory_total_tokens += l_msg_tokens - l_tokenstoremove
         elif msg_role == AIC_ROLE_INTERNAL:
             pass #internal messages are not counted in tokens
 
@@ -493,11 +680,11 @@ class AIConversation:
         It includes sticky messages and handles special cases, such as detecting a new topic.
 
         The function works as follows:
-        - Iterates through the messages in reverse order (starting from the most recent).
-        - Adds messages to the memory list until the memory limit is reached.
-        - Includes sticky messages even if they exceed the memory limit.
-        - Stops adding messages if a "new topic" internal message (`AIC_COMMAND_NEWTOPIC`) is encountered.
-        - Ensures the system message (first message in the conversation) is included if a new topic is found.
+        - The memory window is the last `__max_memory_messages` messages, taken with a single tail slice.
+        - If the most recent "new topic" internal message (`AIC_COMMAND_NEWTOPIC`) falls inside that window
+          (its index is tracked incrementally, no scan needed), memory restarts right after it and the
+          system message is prepended.
+        - Otherwise sticky messages older than the window are included in front of it.
 
         Returns:
             list[AIMessage]: A list of `AIMessage` objects representing the conversation memory.
@@ -511,26 +698,28 @@ class AIConversation:
             for message in memory_messages:
                 print(message.get_text())
         """
-        temp_memory_list: list[AIMessage] = []
-        new_topic_found: bool = False
+        window_start: int = max(len(self.__messages) - self.__max_memory_messages, 0)
 
+        #a new topic inside the window cuts the memory there: system message + everything after it
+        if self.__last_newtopic_index is not None and self.__last_newtopic_index >= window_start:
+            return [self.__messages[0]] + self.__messages[self.__last_newtopic_index + 1:]
 
-        for message in reversed(self.__messages):
-            if len(temp_memory_list) >= self.__max_memory_messages:
-                if message.is_sticky():
-                    temp_memory_list.append(message)
-                continue
+        window: list[AIMessage] = self.__messages[window_start:]
+        if window_start == 0:
+            return window
 
-            if message.get_role() == AIC_ROLE_INTERNAL and message.get_text() == AIC_COMMAND_NEWTOPIC:
-                new_topic_found = True
-                break
-
-            temp_memory_list.append(message)
+        #fast path for the common case: nothing (or only the system prompt) is sticky,
+        #so there is no need to build the dedup set at all
+        if self.__sticky_count == 0:
+            return window
+        if self.__sticky_count == 1 and self.__sticky_refs[0] is self.__messages[0]:
+            return [self.__messages[0]] + window
 
-        if new_topic_found:          #found a new topic (internal) message so we need to add system message
-            temp_memory_list.append(self.__messages[0])
-
-        temp_memory_list.reverse()
+        #sticky messages older than the window come from the pre-filtered list,
+        #deduplicated against the window itself, instead of scanning the prefix
+        window_ids = {id(message) for message in window}
+        temp_memory_list: list[AIMessage] = [message for message in self.__sticky_refs if id(message) not in window_ids]
+        temp_memory_list.extend(window)
 
         return temp_memory_list
 
@@ -571,13 +760,8 @@ class AIConversation:
     def get_conversation_python_history_payload(self) -> list[dict[str, str]]:
         """ Returns the conversation as a payload to be sent to the AI model via the old API Style
         (i.e. not using https). This will only contains the last max_memory messages (plus the system prompt)."""
-        payload_msg_list:list[dict[str, str]] = []
+        return [message.get_message_payload() for message in self.__messages]
 
-        for message in self.__messages:
-            payload_msg_list.append(message.get_message_payload())
-
-        return payload_msg_list
-    
     def toDict(self) -> dict[str, list[dict[str, str]]]:
         """ Returns the conversation as a dictionary to be sent to the AI model via the old API Style
         (i.e. not using https). This will only contains the last max_memory messages (plus the system prompt)."""
@@ -604,35 +788,24 @@ class AIConversation:
         return payload
 
     def to_string(self, memory_only:bool = False, add_sticky:bool = True) -> str:
-        counter:int = 0
-        result:str = "\n"
+        #build the dump as a list of fragments joined once at the end: repeated str
+        #concatenation on a big history degenerates to O(N^2)
+        #(the old "Memory/History Messages" header was overwritten before ever being
+        #emitted, so it is not reproduced here)
+        parts: list[str] = ["\n0 -----------\n", self.__messages[0].to_string() + "\n--"]
 
-        if memory_only:
-            if add_sticky:
-                result = result + "Memory Messages (including sticky)\n"
-            else:
-                result = result + "Memory Messages\n"
-        else:
-            result = result + "History Messages\n"
-        
-        result:str= f"\n{counter} -----------\n" 
-        result += self.__messages[0].to_string() + "\n--"
-
-        last_messages = self.__messages[1:] 
+        boundary:int = len(self.__messages) - self.__max_memory_messages
+        counter:int = 0
 
-        for message in last_messages:
+        for message in self.__messages[1:]:
             counter += 1
-            if memory_only:
-                if add_sticky:
-                    if message.is_sticky() or counter >= (len(self.__messages) - self.__max_memory_messages):
-                        result = result + f"\n{counter}----------\n" + message.to_string() + "\n"
-                else:
-                    if counter >= (len(self.__messages) - self.__max_memory_messages):
-                        result = result + f"\n{counter}----------\n" + message.to_string() + "\n"
-            else:
-                result = result + f"\n{counter}----------\n" + message.to_string() + "\n"
+            if memory_only and not ((add_sticky and message.is_sticky()) or counter >= boundary):
+                continue
+            parts.append(f"\n{counter}----------\n")
+            parts.append(message.to_string())
+            parts.append("\n")
 
-        return result
+        return "".join(parts)
         
 
     def get_messages_copy(self) -> list[AIMessage]:
@@ -642,20 +815,12 @@ class AIConversation:
     def count_non_sticky_messages(self) -> int:
         """ Count non sticky messages in the conversation.
         """
-        count:int = 0
-        for message in self.__messages:
-            if not message.is_sticky():
-                count += 1
-        return count
+        return len(self.__messages) - self.__sticky_count
 
     def count_sticky_messages(self) -> int:
-        """ Count sticky messages in the conversation. 
+        """ Count sticky messages in the conversation.
         """
-        count:int = 0
-        for message in self.__messages:
-            if message.is_sticky():
-                count += 1
-        return count
+        return self.__sticky_count
 
     def count_all_messages(self) -> int:
         """ Count all messages in the conversation. 
@@ -683,31 +848,110 @@ class AIConversation:
         if remove_n_messages < 0:
             raise ValueError("You cannot remove a negative number of messages")
 
+        removed_messages: list[AIMessage] = []
+
         msgs_to_remove: int = min(remove_n_messages, len(self.__messages)-1)
         if msgs_to_remove > 0:
 
             if remove_sticky:
-                self.__messages = self.__messages[:-msgs_to_remove]
+                removed_messages = self.__messages[-msgs_to_remove:]
+                for message in removed_messages:
+                    self.__sticky_count -= message.is_sticky()
+                    self.__internal_count -= message.is_internal()
+                    self.__sticky_internal_count -= message.is_sticky() and message.is_internal()
+                del self.__messages[-msgs_to_remove:]   #in place: no copy of the kept prefix
             else:
+                #single backwards pass: del from the tail is cheap and the system
+                #message (index 0) is never reached. The old second loop re-removed
+                #up to msgs_to_remove EXTRA trailing non-sticky messages on top of
+                #this one — pure duplication, now gone.
                 msgs_to_remove: int = min(msgs_to_remove, self.count_non_sticky_messages())
                 removed_count = 0
                 for i in range(len(self.__messages) - 1, 0, -1):  # Start from the end
                     if not self.__messages[i].is_sticky():
+                        removed_messages.append(self.__messages[i])
+                        self.__internal_count -= self.__messages[i].is_internal()
                         del self.__messages[i]
                         removed_count += 1
                         if removed_count == msgs_to_remove:
                             break
-
-                for _ in range(msgs_to_remove):
-                    if not self.__messages[-1].is_sticky():
-                        self.__messages = self.__messages[:-1]
-                    else:
-                        break
         else:
             return
-        self.recalculate_tokens()
+        self.__last_newtopic_index = self.__find_last_newtopic()
+        self.__rebuild_sticky_refs()
+        self.__subtract_removed_tokens(removed_messages)
+        return
+
+    def __subtract_removed_tokens(self, removed_messages: list[AIMessage]) -> None:
+        """ Private method: incremental counter update after a removal.
+            Subtracts the removed messages from the whole-history totals, recomputes the
+            memory-window sums over the (short) tail slice and rescans the biggest-message
+            trackers only when a removed message was the current maximum — a full
+            recalculate_tokens() pass over the history is no longer needed here.
+        """
+        rescan_user: bool = False
+        rescan_assistant: bool = False
+
+        for message in removed_messages:
+            l_msg_tokens: int = message.get_estimated_tokens()
+            msg_role: str = message.get_role()
+            if msg_role == AIC_ROLE_USER:
+                self.__user_tokens_sum -= l_msg_tokens
+                if l_msg_tokens >= self.__biggest_user_msg_tokens:
+                    rescan_user = True
+            elif msg_role == AIC_ROLE_ASSISTANT:
+                self.__assistant_tokens_sum -= l_msg_tokens
+                if l_msg_tokens >= self.__biggest_assistant_msg_tokens:
+                    rescan_assistant = True
+
+        #a removal historically ended with a full recalculation, which reset the public
+        #counters to the exact whole-history sums; restore that from the running sums
+        self.__user_tokens = self.__user_tokens_sum
+        self.__assistant_tokens = self.__assistant_tokens_sum
+        self.__total_tokens = self.__user_tokens_sum + self.__assistant_tokens_sum + self.__system_message_tokens
+
+        #the memory window shifted: recompute its sums over the last max_memory messages only
+        #(the system message counts towards the memory total whether or not it is in the window)
+        memory_user: int = 0
+        memory_assistant: int = 0
+        memory_total: int = self.__system_message_tokens
+        for message in self.__messages[max(len(self.__messages) - self.__max_memory_messages, 0):]:
+            msg_role: str = message.get_role()
+            if msg_role == AIC_ROLE_USER:
+                l_msg_tokens: int = message.get_estimated_tokens()
+                memory_user += l_msg_tokens
+                memory_total += l_msg_tokens
+            elif msg_role == AIC_ROLE_ASSISTANT:
+                l_msg_tokens: int = message.get_estimated_tokens()
+                memory_assistant += l_msg_tokens
+                memory_total += l_msg_tokens
+        self.__memory_user_tokens = memory_user
+        self.__memory_assistant_tokens = memory_assistant
+        self.__memory_total_tokens = memory_total
+
+        if rescan_user:
+            self.__biggest_user_msg_tokens = max((message.get_estimated_tokens() for message in self.__messages if message.get_role() == AIC_ROLE_USER), default=0)
+        if rescan_assistant:
+            self.__biggest_assistant_msg_tokens = max((message.get_estimated_tokens() for message in self.__messages if message.get_role() == AIC_ROLE_ASSISTANT), default=0)
         return
 
+    def __rebuild_sticky_refs(self) -> None:
+        """ Private method: re-sync the ordered sticky list after removals, stickiness flips
+            or a system-message replacement; inserts keep it up to date incrementally.
+        """
+        self.__sticky_refs = [message for message in self.__messages if message.is_sticky()]
+        return
+
+    def __find_last_newtopic(self) -> int:
+        """ Private method: locate the most recent AIC_COMMAND_NEWTOPIC message (None if there is none).
+            Only used to re-sync __last_newtopic_index after removals; inserts update it incrementally.
+        """
+        for i in range(len(self.__messages) - 1, 0, -1):
+            message = self.__messages[i]
+            if message.get_role() == AIC_ROLE_INTERNAL and message.get_text() == AIC_COMMAND_NEWTOPIC:
+                return i
+        return None
+
     def remove_non_sticky_messages(self, remove_n_messages:int = 1) -> None:
         if remove_n_messages < 0:
             raise ValueError("You cannot remove a negative number of messages")
@@ -719,6 +963,14 @@ class AIConversation:
         """ Remove all messages from the conversation except the system message.
         """
         self.__messages = [self.__messages[0]]
+        self.__last_newtopic_index = None
+        self.__sticky_count = int(self.__messages[0].is_sticky())
+        self.__internal_count = 0
+        self.__sticky_internal_count = 0
+        self.__rebuild_sticky_refs()
+        #one message left: a full recalculation is O(1) here and resets every token
+        #counter (totals, memory window, biggest-message maxima, running sums) exactly
+        self.recalculate_tokens()
         return
 
     def recalculate_tokens(self) -> None:
@@ -730,34 +982,60 @@ class AIConversation:
         self.__memory_total_tokens = 0
         self.__biggest_user_msg_tokens = 0
         self.__biggest_assistant_msg_tokens = 0
-        i:int = 0   
 
-        for message in self.__messages:
-            i=i+1
+        #the window test is hoisted out of the loop: messages before the boundary only
+        #touch the whole-history totals, messages from the boundary on also feed the
+        #memory counters — two branch-free-er passes instead of a per-message check
+        messages:list[AIMessage] = self.__messages
+        boundary:int = max(len(messages) - self.__max_memory_messages, 0)
+
+        for message in messages[:boundary]:
             l_msg_tokens:int = message.get_estimated_tokens()
-        
+
             if message.get_role() == AIC_ROLE_USER:
                 self.__user_tokens += l_msg_tokens
                 self.__total_tokens += l_msg_tokens
-                if i > (len(self.__messages) - self.__max_memory_messages):
-                    self.__memory_user_tokens += l_msg_tokens
-                    self.__memory_total_tokens += l_msg_tokens
                 if l_msg_tokens > self.__biggest_user_msg_tokens:
                     self.__biggest_user_msg_tokens = l_msg_tokens
-        
+
             elif message.get_role() == AIC_ROLE_ASSISTANT:
                 self.__assistant_tokens += l_msg_tokens
                 self.__total_tokens += l_msg_tokens
-                if i > (len(self.__messages) - self.__max_memory_messages):
-                    self.__memory_assistant_tokens += l_msg_tokens
-                    self.__memory_total_tokens += l_msg_tokens
                 if l_msg_tokens > self.__biggest_assistant_msg_tokens:
                     self.__biggest_assistant_msg_tokens = l_msg_tokens
-        
-            elif message.get_role() in [AIC_ROLE_SYSTEM, AIC_ROLE_DEVELOPER]:
+
+            elif message.get_role() in _SYSTEM_ROLES:
+                self.__system_message_tokens = l_msg_tokens
+                self.__total_tokens += l_msg_tokens
+                self.__memory_total_tokens += l_msg_tokens  #the system message always counts towards memory
+
+        for message in messages[boundary:]:
+            l_msg_tokens:int = message.get_estimated_tokens()
+
+            if message.get_role() == AIC_ROLE_USER:
+                self.__user_tokens += l_msg_tokens
+                self.__total_tokens += l_msg_tokens
+                self.__memory_user_tokens += l_msg_tokens
+                self.__memory_total_tokens += l_msg_tokens
+                if l_msg_tokens > self.__biggest_user_msg_tokens:
+                    self.__biggest_user_msg_tokens = l_msg_tokens
+
+            elif message.get_role() == AIC_ROLE_ASSISTANT:
+                self.__assistant_tokens += l_msg_tokens
+                self.__total_tokens += l_msg_tokens
+                self.__memory_assistant_tokens += l_msg_tokens
+                self.__memory_total_tokens += l_msg_tokens
+                if l_msg_tokens > self.__biggest_assistant_msg_tokens:
+                    self.__biggest_assistant_msg_tokens = l_msg_tokens
+
+            elif message.get_role() in _SYSTEM_ROLES:
                 self.__system_message_tokens = l_msg_tokens
                 self.__total_tokens += l_msg_tokens
                 self.__memory_total_tokens += l_msg_tokens
+
+        #after a full pass the public counters ARE the exact sums: re-sync the running ones
+        self.__user_tokens_sum = self.__user_tokens
+        self.__assistant_tokens_sum = self.__assistant_tokens
         return
 
     def get_system_prompt(self) -> str:
@@ -779,28 +1057,33 @@ class AIConversation:
         - If add_sticky is True and memory_only is True, it also counts sticky messages that are not in the last `result` messages.
         - If memory_only is False, it counts all messages in the conversation.
         """
-        result:int           = 0
-        sticky_counted:int   = 0
-        internal_counted:int = 0
+        #the whole-history answer is closed-form from the maintained counters: O(1)
+        if not memory_only:
+            total:int = len(self.__messages)
+            if count_internal and count_sticky:
+                return total
+            if count_internal:
+                #sticky messages are skipped; the skipped (sticky) system message still counts as 1
+                return total - self.__sticky_count + (1 if self.__messages[0].is_sticky() else 0)
+            if count_sticky:
+                return total - self.__internal_count
+            #internal is tested before sticky, so sticky+internal messages are only excluded once
+            return total - self.__internal_count - self.__sticky_count + self.__sticky_internal_count + (1 if self.__messages[0].is_sticky() else 0)
+
+        #memory_only still needs the windowed scan (the window content depends on the flags)
+        result:int = 0
         system_message_reached:bool = False
 
         for message in reversed(self.__messages):
 
-            if (memory_only and (result >= self.__max_memory_messages)) or system_message_reached:
+            if result >= self.__max_memory_messages or system_message_reached:
                 break
 
-            if message.is_internal():
-                internal_counted += 1
-
-            if message.is_sticky():
-                sticky_counted += 1
-
-
             if message.is_internal() and not count_internal:
                 continue
             if message.is_sticky() and not count_sticky:
                 continue
-            if message.get_role() in [AIC_ROLE_SYSTEM, AIC_ROLE_DEVELOPER]:
+            if message.get_role() in _SYSTEM_ROLES:
                 system_message_reached = True
 
             result += 1
@@ -808,23 +1091,6 @@ class AIConversation:
         if not system_message_reached:
             result += 1
 
-        """
-    
-        if memory_only:
-            result = min(len(self.__messages), self.__max_memory_messages+1)
-
-            #now add all sticky messages not in the last result ones
-            if add_sticky:
-                #get the first "len of messages list - result messages" messages
-                messages_to_check = self.__messages[:-result]
-
-                for message in messages_to_check:
-                    if message.is_sticky() and message.get_role() not in [AIC_ROLE_SYSTEM, AIC_ROLE_DEVELOPER, AIC_ROLE_INTERNAL]:
-                        result += 1
-        else:
-            result = len(self.__messages)
-        
-        """
         return result
     
     def get_memory_messages_no(self) -> int:
@@ -834,23 +1100,33 @@ class AIConversation:
         return self.__messages[-1].get_text()
     
     def set_last_message_stickiness(self, sticky:bool) -> None:
-        self.__messages[-1].set_sticky(sticky)
+        self.__set_message_stickiness(self.__messages[-1], sticky)
         return
-    
+
     def set_nth_message_stickiness(self, nth:int, sticky:bool) -> None:
 
         if (nth >= 1) and len(self.__messages) > nth:
-            self.__messages[nth].set_sticky(sticky)   
+            self.__set_message_stickiness(self.__messages[nth], sticky)
         return
 
 
     def set_last_TWO_messages_stickiness(self, sticky:bool) -> None:
         current_len:int = len(self.__messages)
         if current_len >= 1:
-            self.__messages[-1].set_sticky(sticky)
+            self.__set_message_stickiness(self.__messages[-1], sticky)
         if current_len >= 2:
-            self.__messages[-2].set_sticky(sticky)
-        return  
+            self.__set_message_stickiness(self.__messages[-2], sticky)
+        return
+
+    def __set_message_stickiness(self, message:AIMessage, sticky:bool) -> None:
+        """ Private method: flip a message's sticky flag keeping __sticky_count in sync."""
+        if message.is_sticky() != sticky:
+            self.__sticky_count += 1 if sticky else -1
+            if message.is_internal():
+                self.__sticky_internal_count += 1 if sticky else -1
+            message.set_sticky(sticky)
+            self.__rebuild_sticky_refs()
+        return
     
 
     def print(self, memory_only:bool = False, add_sticky:bool = True, text_only:bool = False) -> int:
@@ -870,52 +1146,20 @@ class AIConversation:
         If the message type is an image URL, it prints the URL differently based on its format.
         """
     
-        to_print:bool = False
-        counter:int = 0
         printed_count:int = 0
+        boundary:int = len(self.__messages) - self.__max_memory_messages
+        out:list[str] = []  #one terminal write at the end instead of 2-3 print calls per message
 
-        for message in self.__messages:
-            
-            if message.get_role() == AIC_ROLE_SYSTEM:
-                to_print = True
-            else:
-                if memory_only:
-                    if add_sticky:
-                        if message.is_sticky() or counter >= (len(self.__messages) - self.__max_memory_messages):
-                            to_print = True
-                    else:
-                        if counter >= (len(self.__messages) - self.__max_memory_messages):
-                            to_print = True
-                else:
-                    to_print = True
-                    
-            if to_print:
-                THE_CONTENT_COLOR:str = COLOR_WHITE
-
-                if message.get_role() == AIC_ROLE_USER:
-                    THE_CONTENT_COLOR = COLOR_WHITE
-                elif message.get_role() == AIC_ROLE_ASSISTANT:
-                    THE_CONTENT_COLOR = COLOR_LIGHT_GREEN
-                elif message.get_role() == AIC_ROLE_SYSTEM:
-                    THE_CONTENT_COLOR = COLOR_YELLOW
-                if not text_only:
-                    print(COLOR_CYAN.format(f"{counter} ------------------------------------------ {self.__messages[counter].get_role().upper()} (type={self.__messages[counter].get_type()}, sticky={self.__messages[counter].is_sticky()}):"))
-                print(THE_CONTENT_COLOR.format(f"{self.__messages[counter].get_text()}\n"))
-                #print(f"{counter}: {self.__messages[counter].get_role()}:")
-                #print(f"{self.__messages[counter].get_text()}")
-        
-                if self.__messages[counter].get_type() == AIC_TYPE_IMAGE_URL:
-                    image_url: str = self.__messages[counter].get_url()
-                    if image_url.startswith("data:image"):
-                        print(THE_CONTENT_COLOR .format(f"{image_url[:30]}...{image_url[-30:]}"))
-                        #print(f"{image_url[:30]}...{image_url[-30:]}")
-                    else:
-                        print(THE_CONTENT_COLOR .format(f"{image_url}"))
-                        #print(f"{image_url}")
-                printed_count += 1
+        for counter, message in enumerate(self.__messages):
 
-            counter += 1
-            to_print = False
+            if message.get_role() != AIC_ROLE_SYSTEM and memory_only:
+                if not ((add_sticky and message.is_sticky()) or counter >= boundary):
+                    continue
+
+            out.append(_render_message(message, f"{counter} ------------------------------------------ ", text_only))
+            printed_count += 1
+
+        sys.stdout.write("".join(out))
         return printed_count
 
     def print2(self, memory_only:bool = False, add_sticky:bool = True, add_internal:bool = False, text_only:bool = False) -> int:
@@ -945,51 +1189,46 @@ class AIConversation:
         """ 
 
         my_add_internal:bool = add_internal
+        printed_count:int = 0
+        out:list[str] = []  #one terminal write at the end instead of 2-3 print calls per message
+
         if memory_only:
             my_add_internal = False
+            messages:list[AIMessage] = self.__messages
+            window_start:int = max(len(messages) - self.__max_memory_messages, 0)
+
+            #fast path: no newtopic cut inside the window and no sticky merge needed, so
+            #iterate the tail in place instead of materializing the memory list
+            if (self.__last_newtopic_index is None or self.__last_newtopic_index < window_start) \
+               and (self.__sticky_count == 0 or (self.__sticky_count == 1 and messages[0].is_sticky())):
+                label_base:int = 0
+                if window_start > 0 and self.__sticky_count == 1:
+                    #the sticky system message is prepended ahead of the window
+                    out.append(_render_message(messages[0], "0. ", text_only))
+                    printed_count += 1
+                    label_base = 1
+                for idx in range(window_start, len(messages)):
+                    message = messages[idx]
+                    if message.get_role() == AIC_ROLE_INTERNAL:
+                        continue    #my_add_internal is always False with memory_only
+                    out.append(_render_message(message, f"{label_base + idx - window_start}. ", text_only))
+                    printed_count += 1
+                sys.stdout.write("".join(out))
+                return printed_count
+
             temp_memory_list:list[AIMessage] = self.get_memory_messages()
         else:
             temp_memory_list = self.__messages
 
-        counter:int = 0
-        printed_count:int = 0
+        for counter, message in enumerate(temp_memory_list):
 
-        for message in temp_memory_list:
-            
-            current_role:str = message.get_role()
-            if current_role == AIC_ROLE_INTERNAL and not my_add_internal:
+            if message.get_role() == AIC_ROLE_INTERNAL and not my_add_internal:
                 continue
 
-            THE_CONTENT_COLOR:str = COLOR_WHITE
-
-            if current_role == AIC_ROLE_USER:
-                THE_CONTENT_COLOR = COLOR_WHITE
-            elif current_role == AIC_ROLE_ASSISTANT:
-                THE_CONTENT_COLOR = COLOR_LIGHT_GREEN
-            elif current_role in [AIC_ROLE_SYSTEM, AIC_ROLE_DEVELOPER]:
-                THE_CONTENT_COLOR = COLOR_YELLOW
-            elif current_role == AIC_ROLE_INTERNAL:
-                THE_CONTENT_COLOR = COLOR_GRAY
-            else:
-                THE_CONTENT_COLOR = COLOR_WHITE
-
-            if not text_only:
-                print(COLOR_CYAN.format(f"{counter}. {temp_memory_list[counter].get_role().upper()} (type={temp_memory_list[counter].get_type()}, sticky={temp_memory_list[counter].is_sticky()}):"))
-            print(THE_CONTENT_COLOR.format(f"{temp_memory_list[counter].get_text()}\n"))
-            #print(f"{counter}: {self.__messages[counter].get_role()}:")
-            #print(f"{self.__messages[counter].get_text()}")
-    
-            if self.__messages[counter].get_type() == AIC_TYPE_IMAGE_URL:
-                image_url: str = self.__messages[counter].get_url()
-                if image_url.startswith("data:image"):
-                    print(THE_CONTENT_COLOR .format(f"{image_url[:30]}...{image_url[-30:]}"))
-                    #print(f"{image_url[:30]}...{image_url[-30:]}")
-                else:
-                    print(THE_CONTENT_COLOR .format(f"{image_url}"))
-                    #print(f"{image_url}")
+            out.append(_render_message(message, f"{counter}. ", text_only))
             printed_count += 1
-            counter += 1
-            
+
+        sys.stdout.write("".join(out))
         return printed_count
 
 
@@ -1003,26 +1242,7 @@ class AIConversation:
         """
         result = False
         if 0 <= index < len(self.__messages):
-            message = self.__messages[index]
-            THE_CONTENT_COLOR:str = "\033[97m"  # Default to white
-
-            if message.get_role() == AIC_ROLE_USER:
-                THE_CONTENT_COLOR = "\033[97m"  # White
-            elif message.get_role() == AIC_ROLE_ASSISTANT:
-                THE_CONTENT_COLOR = "\033[92m"  # Light green
-            elif message.get_role() == AIC_ROLE_SYSTEM:
-                THE_CONTENT_COLOR = "\033[93m"  # Yellow
-
-            if not text_only:
-                print(f"\033[96m{index} ------------------------------------------ {message.get_role().upper()} (type={message.get_type()}, sticky={message.is_sticky()}):\033[00m")
-            print(f"{THE_CONTENT_COLOR}{message.get_text()}\033[00m\n")
-
-            if message.get_type() == AIC_TYPE_IMAGE_URL:
-                image_url: str = message.get_url()
-                if image_url.startswith("data:image"):
-                    print(f"{THE_CONTENT_COLOR}{image_url[:30]}...{image_url[-30:]}\033[00m")
-                else:
-                    print(f"{THE_CONTENT_COLOR}{image_url}\033[00m")
+            sys.stdout.write(_render_message(self.__messages[index], f"{index} ------------------------------------------ ", text_only))
             result = True
         else:
             print(f"Invalid message index: {index}. Must be between 0 and {len(self.__messages) - 1}.")
@@ -61,6 +61,70 @@ payload = {
 
 """
 
+class OpenAIResponse:
+    """ Decoded view over one API response dict: the choices[0]/message/usage pointers
+        are resolved once in __init__, so extracting several fields from the same
+        response does one dict lookup per field instead of re-walking the whole
+        structure every time. The free get_* functions below stay as thin wrappers
+        for existing callers; use this class directly when reading multiple fields.
+    """
+    __slots__ = ("_raw", "_choice0", "_msg", "_usage")
+
+    def __init__(self, data) -> None:
+        self._raw = data
+        choices = data.get('choices')
+        self._choice0 = choices[0] if choices else None
+        self._msg = self._choice0.get('message') if self._choice0 else None
+        self._usage = data.get('usage')
+
+    def get_message_content_type(self):
+        return self._msg['content'][0].get('type') if self._msg else None
+
+    def get_message_content_text(self):
+        return self._msg['content'][0].get('text') if self._msg else None
+
+    def get_message_content_image_url(self):
+        return self._msg['content'][0]['image_url'].get('url') if self._msg else None
+
+    def get_finish_reason(self):
+        return self._choice0.get('finish_reason') if self._choice0 else None
+
+    def get_index(self):
+        return self._choice0.get('index') if self._choice0 else None
+
+    def get_logprobs(self):
+        return self._choice0.get('logprobs') if self._choice0 else None
+
+    def get_message(self):
+        return self._msg
+
+    def get_answer(self) -> str:
+        """ This is just the same as get_content so far """
+        return self.get_content()
+
+    def get_content(self) -> str:
+        """ return the actual answer from a Azure OpenAI query """
+        return self._msg.get('content') if self._msg else None
+
+    def get_role(self):
+        return self._msg.get('role') if self._msg else None
+
+    def get_function_call(self):
+        return self._msg.get('function_call') if self._msg else None
+
+    def get_tool_calls(self):
+        return self._msg.get('tool_calls') if self._msg else None
+
+    def get_completion_tokens(self):
+        return self._usage.get('completion_tokens') if self._usage else None
+
+    def get_prompt_tokens(self):
+        return self._usage.get('prompt_tokens') if self._usage else None
+
+    def get_total_tokens(self):
+        return self._usage.get('total_tokens') if self._usage else None
+
+
 def get_temperature(data):
     return data.get('temperature')
 
@@ -71,14 +135,13 @@ def get_max_tokens(data):
     return data.get('max_tokens')
 
 def get_message_content_type(data):
-    return data['choices'][0]['message']['content'][0].get('type') if data.get('choices') and data['choices'][0].get('message') else None
+    return OpenAIResponse(data).get_message_content_type()
 
 def get_message_content_text(data):
-    #return data['choices'][0]['message']['content']
-    return data['choices'][0]['message']['content'][0].get('text') if data.get('choices') and data['choices'][0].get('message') else None
+    return OpenAIResponse(data).get_message_content_text()
 
 def get_message_content_image_url(data):
-    return data['choices'][0]['message']['content'][0]['image_url'].get('url') if data.get('choices') and data['choices'][0].get('message') else None
+    return OpenAIResponse(data).get_message_content_image_url()
 
 def get_id(data):
     return data.get('id')
@@ -87,16 +150,16 @@ def get_choices(data):
     return data.get('choices')
 
 def get_finish_reason(data):
-    return data['choices'][0].get('finish_reason') if data.get('choices') else None
+    return OpenAIResponse(data).get_finish_reason()
 
 def get_index(data):
-    return data['choices'][0].get('index') if data.get('choices') else None
+    return OpenAIResponse(data).get_index()
 
 def get_logprobs(data):
-    return data['choices'][0].get('logprobs') if data.get('choices') else None
+    return OpenAIResponse(data).get_logprobs()
 
 def get_message(data):
-    return data['choices'][0].get('message') if data.get('choices') else None
+    return OpenAIResponse(data).get_message()
 
 def get_answer(data) -> str:
     """ This is just the same as get_content so far """
@@ -104,16 +167,16 @@ def get_answer(data) -> str:
 
 def get_content(data)->str:
     """ return the actual answer from a Azure OpenAI query """
-    return data['choices'][0]['message'].get('content') if data.get('choices') and data['choices'][0].get('message') else None
+    return OpenAIResponse(data).get_content()
 
 def get_role(data):
-    return data['choices'][0]['message'].get('role') if data.get('choices') and data['choices'][0].get('message') else None
+    return OpenAIResponse(data).get_role()
 
 def get_function_call(data):
-    return data['choices'][0]['message'].get('function_call') if data.get('choices') and data['choices'][0].get('message') else None
+    return OpenAIResponse(data).get_function_call()
 
 def get_tool_calls(data):
-    return data['choices'][0]['message'].get('tool_calls') if data.get('choices') and data['choices'][0].get('message') else None
+    return OpenAIResponse(data).get_tool_calls()
 
 def get_created(data):
     return data.get('created')
@@ -131,21 +194,13 @@ def get_usage(data):
     return data.get('usage')
 
 def get_completion_tokens(data):
-    return data['usage'].get('completion_tokens') if data.get('usage') else None
+    return OpenAIResponse(data).get_completion_tokens()
 
 def get_prompt_tokens(data):
-    return data['usage'].get('prompt_tokens') if data.get('usage') else None
+    return OpenAIResponse(data).get_prompt_tokens()
 
 def get_total_tokens(data):
-    return data['usage'].get('total_tokens') if data.get('usage') else None
-"""
-def get_response_tokens(data) ->int:
-    return data['usage']['completion_tokens']
-
-def get_total_tokens(data) ->int:
-    return data['usage']['total_tokens']
-
-"""
+    return OpenAIResponse(data).get_total_tokens()
 
 if __name__ == '__main__':
-    print("OpenAI Answers Decoder - not an executable module.")
\ No newline at end of file
+    print("OpenAI Answers Decoder - not an executable module.")
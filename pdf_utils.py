@@ -338,98 +338,139 @@ def getAnswerFromAIConversation(l_conversation: AIConversation, throttle_seconds
     return answer
 
 
-def pdf_to_images_to_filename(pdf_full_path:str, use_page_no:int = 1) ->str:
+def pdf_to_page_image(pdf_full_path:str, use_page_no:int = 1) ->str:
     """
-        Get a filename from the n-th page of the pdf file.
+        Rasterization stage: convert the n-th page of a PDF into a base64-encoded PNG.
 
-        This Utility function is used to generate a filename based on the content of the n-th page of the PDF.
-        It uses Azure OpenAI to analyze the n-th page (default is the first) and generate a filename.
+        This is the CPU-bound half of pdf_to_images_to_filename, split out so callers
+        can run it separately from the filename-generation stage.
 
-        :params pdf_path: Full path of the PDF file to convert.
-        :params use_page_no: The page number to use for generating the filename (default is page 1).
+        :params pdf_full_path: Full path of the PDF file to convert.
+        :params use_page_no: The page number to rasterize (default is page 1).
 
-        :return: a filename for the pdf file, based on the first page content.
-        If the filename cannot be generated, returns None.
+        :return: the page image as a base64 string, or None if the page does not exist.
     """
 
-    new_filename: str  = None
+    # Tell the kernel the file is about to be read sequentially so the page cache
+    # prefetches ahead of fitz. Not available on Windows; a failed hint is harmless.
+    if hasattr(os, "posix_fadvise"):
+        try:
+            fd: int = os.open(pdf_full_path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL | os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
 
     index_to_use: int = use_page_no-1
     pdf_document = fitz.open(pdf_full_path)
     pdf_length:int = len(pdf_document)
 
     if index_to_use < 0 or index_to_use >= pdf_length:
-        new_filename =  None # type: ignore[reportAssignmentType]
+        base_64_pix: str = None # type: ignore[reportAssignmentType]
     else:
-        # Open the PDF
-        
         page = pdf_document[index_to_use]
-        
+
         pix = page.get_pixmap()  # type: ignore[attr-defined]
 
+        base_64_pix = base64.b64encode(pix.tobytes(output="png")).decode("ascii")  # Convert to base64 string (base64 is pure ASCII, skip UTF-8 validation)
 
-        base_64_pix: str = base64.b64encode(pix.tobytes(output="png")).decode("utf-8")  # Convert to base64 string
-
-        my_prompt = "You are a meticulous assistant helping me to classify documents and generate correct filenames."\
-                        "I will pass you an image with a page of a document and you will return a new filename I can use to save the document. "\
-                        "The filename MUST start with a date in the format YYYY-MM-DD, followed by the name of the issuing entity, "\
-                        "the type of document, the title of the document if present, what the document is about, and the period if applicable and "\
-                        "when applicable, the object of the transaction (a stock, a bond, on object acquired, a service, a payment, a receipt, a contract, etc.). "\
-                        "The output should be a string with the following format: "\
-                        "YYYY-MM-DD - Ente Emittente - Tipo Documento - Titolo del documento - Cosa Riguarda - Periodo. "\
-                        "For the date:"\
-                        "If it is a contract, use the date of the contract"\
-                        "If it is a receipt, use the date of the receipt or the date of the payment if available."\
-                        "If it is a bank statement, use the date of the statement or the date of the last transaction if available."\
-                        "if it is a an agenzia delle entrate document use the data di registrazione if available, otherwise use the data di emissione."\
-                        "Examples:"\
-                        "A document from the Italian Revenue Agency (Agenzia delle Entrate) for the year 2024:"\
-                        "   output:   '2024-01-01 - Agenzia delle Entrate - Documento - Registrazione contratto contractcodehere - 2024'."\
-                        "A bank statement from BANKX for the month of March 2024:"\
-                        "   output:   '2024-03-01 - BANKX - Estratto Conto - Marzo 2024'"\
-                        "A receipt from Enel for the month of January 2025:"\
-                        "   output:   '2025-01-01 - Enel - Ricevuta - Gennaio 2025'. "\
-                        "A contract from Banca Intesa for the year 2025:"\
-                        "   output:   '2024-01-01 - Banca Intesa - Contratto - 2025'. "\
-                        "A receipt from American Express for the month of January 2025:"\
-                        "   output:   '2025-01-01 - American Express - Ricevuta - Gennaio 2025'."\
-                        "A generic contract then the format should be"\
-                        "       YYYY-MM-DD - Ente o persona Emittente - Tipo Documento - Titolo del documento - Cosa Riguarda - Periodo. "\
-                        "A printed document, email, letter or anything with a 'subject' or 'title' field:"\
-                        "   output:   'YYYY-MM-DD - destinatario - Tipo Documento - subject o Titolo del documento - Cosa Riguarda - Periodo'."\
-                        "A document with no date, then the format should be"\
-                        "   output:   '0000-00-00 - destinatario - Tipo Documento - Titolo del documento - Cosa Riguarda - Periodo'."\
-                        "EXTRAS:"\
-                        "The date, must always be in the format YYYY-MM-DD, should be the date of the document, or the expiration date,"\
-                        "or the date of the last update, the issue date, or the date of signature."\
-                        "if there is no date at all and one cannot be meaningfully inferred, use 0000-00-00 as date."\
-                        "if it is just a graphic/image/diagram with no dates in it, just give a short description of the content and use '0000-00-00' as the date for the filename."\
-                        "NEVER use special characters, spaces, slashes, backslashes, stars  or punctuation in the filename."\
-                        "READ CAREFULLY the whole page and understand the context of the document."\
-                        "The filename MUST be descriptive and meaningful, so that I can understand what the document is about just by looking at the filename."\
-                        "The filename MUST be in Italian, if the document is in Italian, or in English, if the document is in English."\
-                        "The output MUST be only the new proposed filename as a SINGLE LINE STRING, with no explanation or additional text."
+    pdf_document.close()
+    return base_64_pix
 
-    
-  
-        max_retries = 3
-        backoff_factor = 2
-        loc_delay: int = 5 #aka     throttle_seconds = 5
-
-        my_conversation = AIConversation(my_prompt)
-        my_conversation.add_message("user", "Give me a filename for this image", "image_url", f"data:image/jpeg;base64,{base_64_pix}")
-
-        answer: str = getAnswerFromAIConversation(my_conversation, throttle_seconds=loc_delay, max_retries=max_retries, backoff_factor=backoff_factor, MAX_RESPONSE_TOKENS=128)
-        if answer is not None and  answer.strip() != "":
-            answer = makeValidFilename(answer)
-            new_filename = answer.strip()
-        else:
-            printColor("pdf_to_images_to_filename() - No answer from Azure OpenAI. Cannot generate a filename.", "red")
-            new_filename = None
 
-    pdf_document.close()
+def page_image_to_filename(base_64_pix:str) ->str:
+    """
+        Filename-generation stage: ask Azure OpenAI for a filename for a page image.
+
+        :params base_64_pix: a base64-encoded PNG of the page, as returned by pdf_to_page_image().
+
+        :return: a filename based on the page content, or None if no answer was obtained.
+    """
+
+    new_filename: str  = None
+
+    my_prompt = "You are a meticulous assistant helping me to classify documents and generate correct filenames."\
+                    "I will pass you an image with a page of a document and you will return a new filename I can use to save the document. "\
+                    "The filename MUST start with a date in the format YYYY-MM-DD, followed by the name of the issuing entity, "\
+                    "the type of document, the title of the document if present, what the document is about, and the period if applicable and "\
+                    "when applicable, the object of the transaction (a stock, a bond, on object acquired, a service, a payment, a receipt, a contract, etc.). "\
+                    "The output should be a string with the following format: "\
+                    "YYYY-MM-DD - Ente Emittente - Tipo Documento - Titolo del documento - Cosa Riguarda - Periodo. "\
+                    "For the date:"\
+                    "If it is a contract, use the date of the contract"\
+                    "If it is a receipt, use the date of the receipt or the date of the payment if available."\
+                    "If it is a bank statement, use the date of the statement or the date of the last transaction if available."\
+                    "if it is a an agenzia delle entrate document use the data di registrazione if available, otherwise use the data di emissione."\
+                    "Examples:"\
+                    "A document from the Italian Revenue Agency (Agenzia delle Entrate) for the year 2024:"\
+                    "   output:   '2024-01-01 - Agenzia delle Entrate - Documento - Registrazione contratto contractcodehere - 2024'."\
+                    "A bank statement from BANKX for the month of March 2024:"\
+                    "   output:   '2024-03-01 - BANKX - Estratto Conto - Marzo 2024'"\
+                    "A receipt from Enel for the month of January 2025:"\
+                    "   output:   '2025-01-01 - Enel - Ricevuta - Gennaio 2025'. "\
+                    "A contract from Banca Intesa for the year 2025:"\
+                    "   output:   '2024-01-01 - Banca Intesa - Contratto - 2025'. "\
+                    "A receipt from American Express for the month of January 2025:"\
+                    "   output:   '2025-01-01 - American Express - Ricevuta - Gennaio 2025'."\
+                    "A generic contract then the format should be"\
+                    "       YYYY-MM-DD - Ente o persona Emittente - Tipo Documento - Titolo del documento - Cosa Riguarda - Periodo. "\
+                    "A printed document, email, letter or anything with a 'subject' or 'title' field:"\
+                    "   output:   'YYYY-MM-DD - destinatario - Tipo Documento - subject o Titolo del documento - Cosa Riguarda - Periodo'."\
+                    "A document with no date, then the format should be"\
+                    "   output:   '0000-00-00 - destinatario - Tipo Documento - Titolo del documento - Cosa Riguarda - Periodo'."\
+                    "EXTRAS:"\
+                    "The date, must always be in the format YYYY-MM-DD, should be the date of the document, or the expiration date,"\
+                    "or the date of the last update, the issue date, or the date of signature."\
+                    "if there is no date at all and one cannot be meaningfully inferred, use 0000-00-00 as date."\
+                    "if it is just a graphic/image/diagram with no dates in it, just give a short description of the content and use '0000-00-00' as the date for the filename."\
+                    "NEVER use special characters, spaces, slashes, backslashes, stars  or punctuation in the filename."\
+                    "READ CAREFULLY the whole page and understand the context of the document."\
+                    "The filename MUST be descriptive and meaningful, so that I can understand what the document is about just by looking at the filename."\
+                    "The filename MUST be in Italian, if the document is in Italian, or in English, if the document is in English."\
+                    "The output MUST be only the new proposed filename as a SINGLE LINE STRING, with no explanation or additional text."
+
+
+    max_retries = 3
+    backoff_factor = 2
+    loc_delay: int = 5 #aka     throttle_seconds = 5
+
+    my_conversation = AIConversation(my_prompt)
+    my_conversation.add_message("user", "Give me a filename for this image", "image_url", f"data:image/jpeg;base64,{base_64_pix}")
+
+    answer: str = getAnswerFromAIConversation(my_conversation, throttle_seconds=loc_delay, max_retries=max_retries, backoff_factor=backoff_factor, MAX_RESPONSE_TOKENS=128)
+    if answer is not None and  answer.strip() != "":
+        answer = makeValidFilename(answer)
+        new_filename = answer.strip()
+    else:
+        printColor("page_image_to_filename() - No answer from Azure OpenAI. Cannot generate a filename.", "red")
+        new_filename = None
+
     return new_filename
 
+
+def pdf_to_images_to_filename(pdf_full_path:str, use_page_no:int = 1) ->str:
+    """
+        Get a filename from the n-th page of the pdf file.
+
+        This Utility function is used to generate a filename based on the content of the n-th page of the PDF.
+        It runs the two stages back to back: pdf_to_page_image() rasterizes the page,
+        page_image_to_filename() asks Azure OpenAI for a name.
+
+        :params pdf_path: Full path of the PDF file to convert.
+        :params use_page_no: The page number to use for generating the filename (default is page 1).
+
+        :return: a filename for the pdf file, based on the first page content.
+        If the filename cannot be generated, returns None.
+    """
+
+    base_64_pix: str = pdf_to_page_image(pdf_full_path, use_page_no)
+    if base_64_pix is None:
+        return None
+
+    return page_image_to_filename(base_64_pix)
+
 def image_file_to_text(the_image_path:str) -> str:
     the_result:str = ""
     
@@ -559,6 +600,31 @@ def list_pdf_in_folder(folder_path: str) -> list[str]:
     return pdf_files
 
 
+def list_pdf_in_folder_with_stat(folder_path: str) -> list[tuple[str, os.stat_result]]:
+    """
+    Lists all PDF files in the specified folder, together with their stat result.
+
+    Uses os.scandir, which gets the metadata from the directory read itself, so the
+    caller can reuse the cached mtime (e.g. for a file-date fallback) without
+    paying a second stat() syscall per file. is_file() is likewise answered from
+    the directory entry, so skipping subfolders and symlinks costs no extra stat.
+
+    :param folder_path: Path to the folder where PDF files are located.
+    :return: List of (full path, stat_result) tuples for the PDF files in the folder,
+    sorted by path so runs are deterministic.
+    """
+
+    pdf_files: list[tuple[str, os.stat_result]] = []
+
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if entry.is_file(follow_symlinks=False) and entry.name.lower().endswith(".pdf"):
+                pdf_files.append((entry.path, entry.stat()))
+
+    pdf_files.sort(key=lambda pair: pair[0])
+    return pdf_files
+
+
 if __name__ == '__main__':
     print("pdf_utils.py - not an executable module.")
 
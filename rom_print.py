@@ -1,4 +1,6 @@
+import atexit
 from datetime import datetime
+from functools import lru_cache
 
 #used by prinColor functions
 COLOR_RED:str          = "\033[31m {}\033[00m"
@@ -18,108 +20,107 @@ COLOR_LIGHT_MAGENTA:str= "\033[95m {}\033[00m"
 COLOR_LIGHT_CYAN:str   = "\033[96m {}\033[00m"
 COLOR_LIGHT_WHITE:str  = "\033[97m {}\033[00m"
 
+DEBUG_MODE: bool = True     #module-level so callers can actually switch debug printing off at runtime
+
+@lru_cache(maxsize=8)
+def _get_log_file(path: str):
+    """ keep debug log files open across calls: an open/write/close per line costs far
+        more in syscalls than the write itself. Closed (and flushed) at interpreter exit.
+    """
+    file = open(path, "a", encoding="utf-8", buffering=8192)
+    atexit.register(file.close)
+    return file
+
 def debugLog(any_variable, color: str = "gray", calling_function:str="", filename:str=None) -> None:
-    """ 
-    print a stringin color if DEBUG_MODE=True. Also write on file if DEBUG_ON_FILE is True
     """
-    DEBUG_MODE: bool    = True
-    DEBUG_ON_FILE: bool = filename is not None 
-    DEBUG_FILENAME:str  = filename.strip() if filename is not None else "debug_log.txt"
+    print a stringin color if DEBUG_MODE=True. Also write on file if filename is given
+    """
+    if not DEBUG_MODE and filename is None:
+        return
 
     timestamp: str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
+
     debug_string:str = timestamp + " - " + calling_function + " - " + str(any_variable)
     if DEBUG_MODE:
-        #print('DEBUG: ', end='')  
+        #print('DEBUG: ', end='')
         printColor(debug_string, color)
-    
-    if DEBUG_ON_FILE:
-        
+
+    if filename is not None:
+
         try:
-            with open(DEBUG_FILENAME, "a", encoding="utf-8") as file:
-                file.write(debug_string + "\n")
+            _get_log_file(filename.strip()).write(debug_string + "\n")
         except Exception:
-            printColor("Error writing to file: " + DEBUG_FILENAME, "red")
+            printColor("Error writing to file: " + filename.strip(), "red")
 
     return
 
-def printColorSameLine(text: str, color:str="white"):
-    """ funtion to print a text in color WITHOUT newline """
-    if color.strip().lower() == "red":
-        print(COLOR_RED .format(text), end="")
-    elif color.strip().lower() == "green":
-        print(COLOR_GREEN .format(text), end="")
-    elif color.strip().lower() == "blue":
-        print(COLOR_BLUE .format(text), end="")
-    elif color.strip().lower() == "yellow":
-        print(COLOR_YELLOW .format(text), end="")
-    elif color.strip().lower() == "pink":
-        print(COLOR_PINK .format(text), end="")
-    elif color.strip().lower() == "cyan":
-        print(COLOR_CYAN .format(text), end="")
-    elif color.strip().lower() == "white":
-        print(COLOR_WHITE .format(text), end="")
-    elif color.strip().lower() == "black":
-        print(COLOR_BLACK .format(text), end="")
-    elif color.strip().lower() == "gray":
-        print(COLOR_GRAY .format(text), end="")
-    elif color.strip().lower() == "light_red":
-        print(COLOR_LIGHT_RED .format(text), end="")
-    elif color.strip().lower() == "light_green":
-        print(COLOR_LIGHT_GREEN .format(text), end="")
-    elif color.strip().lower() == "light_yellow":
-        print(COLOR_LIGHT_YELLOW .format(text), end="")
-    elif color.strip().lower() == "light_blue":
-        print(COLOR_LIGHT_BLUE .format(text), end="")
-    elif color.strip().lower() == "light_magenta":
-        print(COLOR_LIGHT_MAGENTA .format(text), end="")
-    elif color.strip().lower() == "light_cyan":
-        print(COLOR_LIGHT_CYAN .format(text), end="")
-    elif color.strip().lower() == "light_white":
-        print(COLOR_LIGHT_WHITE .format(text), end="")
+#color name -> template, built once at import: one dict lookup replaces the
+#16-branch elif ladder (and its repeated .strip().lower() calls) per print
+_COLOR_MAP: dict[str, str] = {
+    "red": COLOR_RED,
+    "green": COLOR_GREEN,
+    "blue": COLOR_BLUE,
+    "yellow": COLOR_YELLOW,
+    "pink": COLOR_PINK,
+    "cyan": COLOR_CYAN,
+    "white": COLOR_WHITE,
+    "black": COLOR_BLACK,
+    "gray": COLOR_GRAY,
+    "light_red": COLOR_LIGHT_RED,
+    "light_green": COLOR_LIGHT_GREEN,
+    "light_yellow": COLOR_LIGHT_YELLOW,
+    "light_blue": COLOR_LIGHT_BLUE,
+    "light_magenta": COLOR_LIGHT_MAGENTA,
+    "light_cyan": COLOR_LIGHT_CYAN,
+    "light_white": COLOR_LIGHT_WHITE,
+}
 
+#prefix/suffix pairs split out of the templates above once at import: plain string
+#concatenation in the hot path instead of running str.format's parser on every call
+#(the COLOR_* constants stay as format strings because callers .format() them directly)
+_COLOR_PARTS: dict[str, tuple[str, str]] = {
+    name: (template[:template.index("{}")], template[template.index("{}") + 2:])
+    for name, template in _COLOR_MAP.items()
+}
+
+def make_color_printer(color: str, same_line: bool = False):
+    """ prebind a color for hot call sites: the returned function has the ANSI
+        prefix/suffix already resolved, so each call skips the name normalization
+        and dict lookup that printColor pays. Unknown colors print plain.
+    """
+    parts: tuple[str, str] = _COLOR_PARTS.get(color.strip().lower()) if color else None
+    end: str = "" if same_line else "\n"
+
+    if parts:
+        prefix, suffix = parts
+        def color_printer(text: str) -> None:
+            print(f"{prefix}{text}{suffix}", end=end)
     else:
-        print(text, end="")
+        def color_printer(text: str) -> None:
+            print(text, end=end)
+
+    return color_printer
+
+def _emit(text: str, color: str, end: str) -> None:
+    """ shared worker for printColor/printColorSameLine: unknown colors print plain """
+    #try the raw name first: call sites pass lowercase literals, so the common case
+    #is a single dict hit with no strip().lower() string churn
+    parts: tuple[str, str] = (_COLOR_PARTS.get(color) or _COLOR_PARTS.get(color.strip().lower())) if color else None
+    if parts:
+        print(f"{parts[0]}{text}{parts[1]}", end=end)
+    else:
+        print(text, end=end)
+    return
+
+def printColorSameLine(text: str, color:str="white"):
+    """ funtion to print a text in color WITHOUT newline """
+    _emit(text, color, "")
     return
 
 
 def printColor(text: str, color:str="white") -> None:
     """ print a text in the defined color """
-    if color.strip().lower() == "red":
-        print(COLOR_RED .format(text))
-    elif color.strip().lower() == "green":
-        print(COLOR_GREEN .format(text))
-    elif color.strip().lower() == "blue":
-        print(COLOR_BLUE .format(text))
-    elif color.strip().lower() == "yellow":
-        print(COLOR_YELLOW .format(text))
-    elif color.strip().lower() == "pink":
-        print(COLOR_PINK .format(text))
-    elif color.strip().lower() == "cyan":
-        print(COLOR_CYAN .format(text))
-    elif color.strip().lower() == "white":
-        print(COLOR_WHITE .format(text))
-    elif color.strip().lower() == "black":
-        print(COLOR_BLACK .format(text))
-    elif color.strip().lower() == "gray":
-        print(COLOR_GRAY .format(text))
-    elif color.strip().lower() == "light_red":
-        print(COLOR_LIGHT_RED .format(text))
-    elif color.strip().lower() == "light_green":
-        print(COLOR_LIGHT_GREEN .format(text))
-    elif color.strip().lower() == "light_yellow":
-        print(COLOR_LIGHT_YELLOW .format(text))
-    elif color.strip().lower() == "light_blue":
-        print(COLOR_LIGHT_BLUE .format(text))
-    elif color.strip().lower() == "light_magenta":
-        print(COLOR_LIGHT_MAGENTA .format(text))
-    elif color.strip().lower() == "light_cyan":
-        print(COLOR_LIGHT_CYAN .format(text))
-    elif color.strip().lower() == "light_white":
-        print(COLOR_LIGHT_WHITE .format(text))
-
-    else:
-        print(text)
+    _emit(text, color, "\n")
     return
 
 def printTwoColors(string1:str, color1:str, string2:str, color2:str) -> None:
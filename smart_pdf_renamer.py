@@ -8,20 +8,72 @@ THE_LICENSE="MIT License"
 
 import os
 import sys
-import getopt
-from rom_print import printColor, printCredits, printTwoColors
-from pdf_utils import pdf_to_images_to_filename, list_pdf_in_folder, get_file_date
-
-
-def showHelp():
-    print("Usage: python " + THE_PROGRAM + " [OPTIONS]")
-    print("Options:")
-    print("  -p, --pdf_folder <folder>         Specify the folder containing PDFs")
-    print("  -h, --help                        Show this help message")
-    print("Example:")
-    print("  python " + THE_PROGRAM + " -p PDF")
-    print("  python " + THE_PROGRAM + " -h")
-    print("  python " + THE_PROGRAM + " --help")
+import time
+import atexit
+import queue
+import shelve
+import hashlib
+import argparse
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from rom_print import make_color_printer, printColor, printCredits, printTwoColors
+from pdf_utils import pdf_to_images_to_filename, list_pdf_in_folder_with_stat
+
+#prebound printers for the per-PDF loop: the color name is resolved once at import
+#instead of on every progress/error line
+print_green  = make_color_printer("green")
+print_yellow = make_color_printer("yellow")
+print_red    = make_color_printer("red")
+
+
+def process_one_pdf(the_pdf: str, pdf_count: int, how_many_pdfs: int) -> str:
+    """
+    Worker for the process pool: rasterize the first page of one PDF and ask the
+    model for a filename. Must stay a top-level function (pickled by the pool).
+    All filesystem moves and logging stay in the main process.
+    """
+    printTwoColors(f"Looking at PDF {pdf_count}/{how_many_pdfs}: ", "green", the_pdf, "pink")
+    sys.stdout.flush()  #workers inherit the block-buffered stdout: without this the
+                        #progress line only shows up when the pool shuts down
+    return pdf_to_images_to_filename(the_pdf)
+
+
+def log_writer(log_file, log_q: "queue.Queue") -> None:
+    """
+    Dedicated log-writer loop: take one line from the queue (blocking), drain
+    whatever else queued up meanwhile, and write the batch as a single string,
+    so bursts of results cost one write call instead of one per line.
+    A None entry is the shutdown sentinel.
+    """
+    while True:
+        line = log_q.get()
+        if line is None:
+            return
+        lines: list[str] = [line]
+        while True:
+            try:
+                line = log_q.get_nowait()
+            except queue.Empty:
+                break
+            if line is None:
+                log_file.write("".join(lines))
+                return
+            lines.append(line)
+        log_file.write("".join(lines))
+
+
+def pdf_cache_key(pdf_path: str) -> str:
+    """
+    Cache key for a PDF: BLAKE2b of the whole content, read in 64KB chunks.
+    Content-based, so the same document hits the cache on a re-run even if the
+    file was renamed meanwhile — and two documents sharing a prefix never
+    collide, which would silently reuse the wrong cached filename.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(pdf_path, "rb") as pdf_file:
+        for chunk in iter(lambda: pdf_file.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
 #################   MAIN STARTS HERE   ##################################
@@ -32,50 +84,38 @@ def main():
     LOG_FILE: str = "smart_renamer.log"
 
 
-    # Remove 1st argument from the list of command line arguments
-    argumentList: list[str] = sys.argv[1:]
-    # Options
-    options = "p:h"
-    # Long options
-    long_options: list[str] = ["pdf_folder=", "help"]
-
+    # Block-buffer stdout: progress goes out in one write per processed PDF (the
+    # flush at the end of each iteration below) instead of a syscall per message.
+    # Matters when stdout is a slow TTY or redirected to a file over the network.
     try:
-        # Parsing argument
-        arguments, values = getopt.getopt(argumentList, options, long_options)
-        for currentArgument, currentValue in arguments:
-    
-            if currentArgument in ("-p", "--pdf_folder"):
-                
-                currentValue = os.path.normpath(currentValue)
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+    except Exception:
+        pass    #not a regular text stream (e.g. replaced by a test harness): keep it as is
+    atexit.register(sys.stdout.flush)   #drain buffered output on every exit path
 
-                if os.path.isdir(currentValue):
-                    PDF_FOLDER = currentValue
-                    PDF_DONE_FOLDER = os.path.join(PDF_FOLDER, "DONE")
-                else:
-                    printColor("Invalid argument (not a dir): " + currentArgument + " " + currentValue + ". Using default:" + str(PDF_FOLDER), "red")
+    # Parsing arguments (argparse also provides the -h/--help output)
+    parser = argparse.ArgumentParser(prog=THE_PROGRAM)
+    parser.add_argument("-p", "--pdf_folder", metavar="<folder>", help="Specify the folder containing PDFs")
+    args = parser.parse_args()
 
-                #create the PDF_DONE_FOLDER if it does not exist
-                if not os.path.exists(PDF_DONE_FOLDER):
-                    try:
-                        os.makedirs(PDF_DONE_FOLDER)
-                        printColor(f"Created folder: {PDF_DONE_FOLDER}", "green")
-                    except Exception as e:
-                        printColor(f"Failed to create folder {PDF_DONE_FOLDER}: {str(e)}", "red")
-                        os._exit(1)
+    if args.pdf_folder is not None:
 
-            elif currentArgument in ("-h", "--help"):
-                showHelp()
-                os._exit(0)
+        currentValue = os.path.normpath(args.pdf_folder)
 
-            else:
-                showHelp()
-                os._exit(1)
+        if os.path.isdir(currentValue):
+            PDF_FOLDER = currentValue
+            PDF_DONE_FOLDER = os.path.join(PDF_FOLDER, "DONE")
+        else:
+            printColor("Invalid argument (not a dir): --pdf_folder " + currentValue + ". Using default:" + str(PDF_FOLDER), "red")
 
-    except getopt.error as err:
-        # output error, and return with an error code
-        print("Argument parsing error: " + str(err))
-        showHelp()
-        os._exit(2)
+        #create the PDF_DONE_FOLDER if it does not exist
+        if not os.path.exists(PDF_DONE_FOLDER):
+            try:
+                os.makedirs(PDF_DONE_FOLDER)
+                printColor(f"Created folder: {PDF_DONE_FOLDER}", "green")
+            except Exception as e:
+                printColor(f"Failed to create folder {PDF_DONE_FOLDER}: {str(e)}", "red")
+                sys.exit(1)
 
     #BUILD the full path for log file (inside the PDF_FOLDER)
     LOG_FILE = os.path.join(PDF_FOLDER, LOG_FILE)
@@ -88,9 +128,17 @@ def main():
         printColor(f"Renamed existing log file to: {old_log_file}", "yellow")
     
     #write "PDF_ORIGINAL_FILNAME, PDF_NEW_FILENAME" to the log file
-    with open(LOG_FILE, 'w', encoding="utf-8") as log_file:
-        log_file.write("PDF_ORIGINAL_FILENAME, PDF_NEW_FILENAME\n")
-        printColor(f"Created log file: {LOG_FILE}", "green")
+    #one handle for the whole run (line-buffered so every row hits disk promptly)
+    #instead of an open/close syscall pair per processed PDF
+    log_file = open(LOG_FILE, 'w', encoding="utf-8", buffering=1)
+    log_file.write("PDF_ORIGINAL_FILENAME, PDF_NEW_FILENAME\n")
+    printColor(f"Created log file: {LOG_FILE}", "green")
+
+    # all log lines funnel through one writer thread, which coalesces bursts of
+    # results into single write calls (and keeps the handle single-threaded)
+    log_q: queue.Queue = queue.Queue()
+    log_thread = threading.Thread(target=log_writer, args=(log_file, log_q), daemon=True)
+    log_thread.start()
 
     printCredits(THE_PROGRAM, THE_VERSION, THE_AUTHOR, THE_DATE, THE_COPYRIGHT, THE_LICENSE)
     printTwoColors("PDF Folder: ", "white", PDF_FOLDER, "green")
@@ -98,73 +146,129 @@ def main():
     printTwoColors("LOG_FILE: ", "white", LOG_FILE, "green")
 
 
-    my_pdfs:list[str] = list_pdf_in_folder(PDF_FOLDER)
+    # (path, stat) pairs: the scandir-cached mtime serves as the date fallback below
+    # without a second stat() per PDF
+    my_pdfs:list[tuple[str, os.stat_result]] = list_pdf_in_folder_with_stat(PDF_FOLDER)
     #CVs = read_pdfs_from_folder_with_pdfplumber(PDF_FOLDER)
 
     how_many_pdfs: int = len(my_pdfs)
     if how_many_pdfs == 0:
         printColor("No PDF found in folder: " + PDF_FOLDER, "red")
-        os._exit(3)
+        sys.exit(3)
     else:
         printColor(f"{THE_PROGRAM} - Found {how_many_pdfs} PDFs in folder: " + PDF_FOLDER, "green")
 
-    pdf_count:int = 0
-
     message_to_log: str = ""
 
     # Create the PDF_DONE_FOLDER if it does not exist
-    if not os.path.exists(PDF_DONE_FOLDER):
-        os.makedirs(PDF_DONE_FOLDER)
+    os.makedirs(PDF_DONE_FOLDER, exist_ok=True)
+
+    # Snapshot the DONE folder once: one directory read instead of a stat() per PDF
+    # for the collision check below. Renames done this run are added to the set.
+    existing_done_files: set[str] = {e.name for e in os.scandir(PDF_DONE_FOLDER)}
 
-    # Process each CV using the filename and the text content
-    for the_pdf in my_pdfs:
-        pdf_count += 1
-        printTwoColors(f"Looking at PDF {pdf_count}/{how_many_pdfs}: ", "green", the_pdf, "pink")
+    # Persistent answers cache, keyed by PDF content hash: a re-run over the same
+    # folder (or the same document under a new name) skips the rasterize+model
+    # stage entirely and goes straight to the rename
+    rename_cache = shelve.open(os.path.join(PDF_FOLDER, ".rename_cache.db"))
 
-        the_new_filename: str = pdf_to_images_to_filename(the_pdf) 
+    # Each PDF is independent and the rasterize+LLM stage is the expensive part, so it
+    # runs in a process pool; renames, collision checks and logging happen here in the
+    # main process as results arrive, so the filesystem logic stays single-threaded.
+    try:
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count(), how_many_pdfs)) as executor:
+            futures = {}
+            for pdf_count, (the_pdf, the_stat) in enumerate(my_pdfs, 1):
+                cache_key: str = pdf_cache_key(the_pdf)
+                cached_name: str = rename_cache.get(cache_key)
+                if cached_name is not None:
+                    printTwoColors(f"Cached filename for PDF {pdf_count}/{how_many_pdfs}: ", "green", the_pdf, "pink")
+                    future = Future()
+                    future.set_result(cached_name)
+                else:
+                    future = executor.submit(process_one_pdf, the_pdf, pdf_count, how_many_pdfs)
+                futures[future] = (the_pdf, the_stat, pdf_count, cache_key, cached_name is None)
 
-        if the_new_filename is not None and the_new_filename != "":
-            the_new_filename= the_new_filename + ".pdf"
+            for future in as_completed(futures):
+                the_pdf, the_stat, pdf_count, cache_key, is_fresh = futures[future]
 
-            #if starts with "0000-00-00" then  replace the "0000-00-00" with the original file date
-            if the_new_filename.startswith("0000-00-00"):
-                original_file_date:str = get_file_date(the_pdf)
-                new_pdf_path = the_new_filename.replace("0000-00-00", original_file_date)
-                the_new_filename = new_pdf_path
-                printColor(f"Date not found. replacing with original file date: {original_file_date}", "red")
+                try:
+                    the_new_filename: str = future.result()
+                except Exception as e:
+                    print_red(f"Failed to process PDF {pdf_count} ({the_pdf}): {str(e)}")
+                    the_new_filename = None
 
-            # if the file exist in the PDF_DONE_FOLDER, append the pdf_count to the filename
-            if os.path.exists(os.path.join(PDF_DONE_FOLDER, the_new_filename)):
-                base, ext = os.path.splitext(the_new_filename)
-                the_new_filename = f"{base}_{pdf_count}{ext}"
-                printColor(f"File already exists in DONE folder. Renaming to {the_new_filename}", "yellow")
+                # remember fresh answers (never failures) for the next run
+                if is_fresh and the_new_filename is not None and the_new_filename != "":
+                    rename_cache[cache_key] = the_new_filename
 
-            printTwoColors(f"New filename for pdf {pdf_count}:", "green", the_new_filename, "pink")
+                if the_new_filename is not None and the_new_filename != "":
+                    the_new_filename= the_new_filename + ".pdf"
 
-            try:
+                    #if starts with "0000-00-00" then  replace the "0000-00-00" with the original file date
+                    if the_new_filename.startswith("0000-00-00"):
+                        original_file_date:str = time.strftime("%Y-%m-%d", time.localtime(the_stat.st_mtime))
+                        the_new_filename = the_new_filename.replace("0000-00-00", original_file_date)
+                        print_red(f"Date not found. replacing with original file date: {original_file_date}")
 
-                #os.rename(the_pdf, the_new_filename)
-                # Move the renamed PDF to the DONE folder
-                new_pdf_path: str = os.path.join(PDF_DONE_FOLDER, os.path.basename(the_new_filename))
+                    # the filename is final from here on: split it once and reuse the parts
+                    base, ext = os.path.splitext(the_new_filename)
 
-                os.rename(the_pdf, new_pdf_path)
-                the_new_filename = new_pdf_path  # Update the new filename to the moved path
-                
-                message_to_log = f"{the_pdf}, {the_new_filename}"
+                    printTwoColors(f"New filename for pdf {pdf_count}:", "green", the_new_filename, "pink")
 
-                printColor(f"Moved PDF {pdf_count} to DONE folder: {the_new_filename}", "green")
-                printColor(f"Renamed PDF {pdf_count} from {the_pdf} *** to *** {the_new_filename}", "green")
+                    try:
+
+                        # Move the renamed PDF to the DONE folder.
+                        # os.link refuses to overwrite an existing target, so claiming the
+                        # name is atomic: a collision raises FileExistsError and we retry
+                        # with the next numeric suffix (no exists()+rename() race).
+                        # The snapshot set just skips known names without a syscall.
+                        name_suffix: int = 0
+                        while True:
+                            candidate: str = the_new_filename if name_suffix == 0 else f"{base}_{name_suffix}{ext}"
+                            if candidate in existing_done_files:
+                                name_suffix += 1
+                                continue
+                            new_pdf_path: str = os.path.join(PDF_DONE_FOLDER, candidate)
+                            try:
+                                os.link(the_pdf, new_pdf_path)
+                                os.unlink(the_pdf)
+                            except FileExistsError:
+                                name_suffix += 1
+                                continue
+                            except OSError:
+                                #filesystem without hard links: fall back to a plain rename
+                                os.rename(the_pdf, new_pdf_path)
+                            break
+
+                        if name_suffix > 0:
+                            print_yellow(f"File already exists in DONE folder. Renaming to {candidate}")
+
+                        existing_done_files.add(candidate)
+                        the_new_filename = new_pdf_path  # Update the new filename to the moved path
+
+                        message_to_log = f"{the_pdf}, {the_new_filename}"
+
+                        print_green(f"Moved PDF {pdf_count} to DONE folder: {the_new_filename}")
+                        print_green(f"Renamed PDF {pdf_count} from {the_pdf} *** to *** {the_new_filename}")
+                    
+                    except Exception as e:
+                        print_red(f"Failed to rename PDF {pdf_count} from {the_pdf} to {the_new_filename}: {str(e)}")
+                        # Log the original and new filenames
+                        message_to_log = f"{the_pdf}, Error renaming"
+                else:
+                    print_red(f"Failed to find a new name for PDF {pdf_count}: {the_pdf}")
+                    message_to_log = f"{the_pdf}, No new name found"            
                 
-            except Exception as e:
-                printColor(f"Failed to rename PDF {pdf_count} from {the_pdf} to {the_new_filename}: {str(e)}", "red")
-                # Log the original and new filenames
-                message_to_log = f"{the_pdf}, Error renaming"
-        else:
-            printColor(f"Failed to find a new name for PDF {pdf_count}: {the_pdf}", "red")
-            message_to_log = f"{the_pdf}, No new name found"            
-            
-        with open(LOG_FILE, 'a', encoding="utf-8") as log_file:
-            log_file.write(f"{message_to_log}\n")
+                log_q.put(f"{message_to_log}\n")
+                sys.stdout.flush()
+
+    finally:
+        log_q.put(None)     #sentinel: flush what is queued and stop the writer
+        log_thread.join()
+        rename_cache.close()
+        log_file.close()
+        sys.stdout.flush()
 
     print("that's all folks!")
 